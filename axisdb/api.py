@@ -7,19 +7,34 @@ Engine details live in [`axisdb.engine.storage`](axisdb/engine/storage.py:1),
 
 from __future__ import annotations
 
+import heapq
 import json
+from bisect import bisect_left, insort
+from contextlib import suppress
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Literal
 
-from axisdb.engine.keycodec import decode_key, encode_key
+from axisdb.engine.keycodec import decode_key, encode_key, encode_validated_key
 from axisdb.engine.locking import FileLock, FileLockSpec, LockMode, LockPaths
 from axisdb.engine.storage import (
+    FORMAT_VERSION,
+    DiskSignature,
     FieldIndexDef,
     StoragePaths,
+    WalRecord,
+    append_wal,
+    apply_wal,
+    clear_wal,
     default_payload,
+    disk_signature,
+    encode_wal_commit,
     read_validated,
+    read_wal,
     recover_if_needed,
+    reset_wal,
+    wal_generation,
+    wal_size,
     write_atomic,
 )
 from axisdb.errors import (
@@ -57,6 +72,17 @@ class AxisDB:
         init=False, default_factory=dict
     )
     _field_index_defs: list[FieldIndexDef] = field(init=False, default_factory=list)
+    _persisted_field_index_defs: list[FieldIndexDef] = field(
+        init=False, default_factory=list
+    )
+    # True when base data has WAL changes not reflected in the field indexes.
+    # The prefix keys are kept in step with base data at all times.
+    _indexes_dirty: bool = field(init=False, default=False)
+    # Snapshot format version and generation the base state was loaded from.
+    _format_version: int = field(init=False, default=FORMAT_VERSION)
+    _generation: int = field(init=False, default=0)
+    # Fingerprint of the files the base state was loaded from.
+    _loaded_signature: DiskSignature | None = field(init=False, default=None)
 
     _overlay_set: dict[str, Any] = field(init=False, default_factory=dict)
     _overlay_del: set[str] = field(init=False, default_factory=set)
@@ -92,7 +118,17 @@ class AxisDB:
 
         storage_paths = StoragePaths(db_path=p)
         payload = default_payload(dimensions=dimensions)
+        # Continue past the generation of a database being overwritten, so
+        # readers' fingerprints of the old one can never match the new one.
+        with suppress(StorageCorruptionError):
+            previous = wal_generation(storage_paths)
+            if previous is not None:
+                payload["meta"]["generation"] = previous + 1
+        # Drop any WAL left by a previous database at this path before the new
+        # snapshot exists, so its records can never be replayed onto it.
+        clear_wal(storage_paths)
         write_atomic(storage_paths, payload)
+        reset_wal(storage_paths, payload["meta"]["generation"])
         return cls.open(p, mode="rw", lock=lock)
 
     @property
@@ -176,23 +212,53 @@ class AxisDB:
         if self.lock:
             lock_mode = LockMode.SHARED
             with FileLock(FileLockSpec(self._lock_paths.rw_lock, lock_mode)):
+                signature = disk_signature(self._storage_paths)
                 payload = read_validated(self.path)
+                wal_records = read_wal(self._storage_paths, payload)
         else:
+            signature = disk_signature(self._storage_paths)
             payload = read_validated(self.path)
+            wal_records = read_wal(self._storage_paths, payload)
+        # Taken before reading: a concurrent change can only cause a spurious
+        # reload later, never a missed one.
+        self._loaded_signature = signature
 
         self._dimensions = int(payload["meta"]["dimensions"])
-        self._base_data = dict(payload.get("data", {}))
-        index_payload = payload.get("index", {})
-        self._base_prefix_keys = list(index_payload.get("prefix_keys", []))
-        self._base_field_indexes = dict(index_payload.get("fields", {}))
+        self._format_version = payload["format_version"]
+        self._generation = payload["meta"]["generation"]
+        # The payload was just parsed and is owned by this handle; no copies needed.
+        self._base_data = payload["data"]
+        index_payload = payload["index"]
+        self._base_prefix_keys = index_payload.get("prefix_keys", [])
+        self._base_field_indexes = index_payload.get("fields", {})
         self._field_index_defs = list(
             payload["meta"].get("indexes", {}).get("fields", [])
         )
+        self._persisted_field_index_defs = list(self._field_index_defs)
+
+        # Persisted indexes describe the snapshot only; WAL changes make them
+        # stale until rebuilt.
+        apply_wal(self._base_data, wal_records)
+        if wal_records or len(self._base_prefix_keys) != len(self._base_data):
+            self._base_prefix_keys = rebuild_prefix_keys(self._base_data)
+        self._indexes_dirty = bool(wal_records)
 
         # Clear overlays after a reload.
         self._overlay_set.clear()
         self._overlay_del.clear()
 
+    def _refresh_from_disk(self) -> None:
+        """Reload base state unless the DB files are unchanged since last load."""
+
+        if self.lock:
+            with FileLock(FileLockSpec(self._lock_paths.rw_lock, LockMode.SHARED)):
+                signature = disk_signature(self._storage_paths)
+        else:
+            signature = disk_signature(self._storage_paths)
+        if signature == self._loaded_signature:
+            return
+        self._reload_base_from_disk()
+
     def _assert_writable(self) -> None:
         if self.mode != "rw":
             raise ReadOnlyError("Database opened in read-only mode")
@@ -213,7 +279,7 @@ class AxisDB:
 
     def get(self, key: tuple[str, ...]) -> Any:
         self._assert_key(key)
-        ek = encode_key(key)
+        ek = encode_validated_key(key)
 
         if ek in self._overlay_del:
             raise KeyError(key)
@@ -221,8 +287,8 @@ class AxisDB:
             return self._overlay_set[ek]
 
         if self.mode == "r":
-            # Read-only uses fresh reads per call.
-            self._reload_base_from_disk()
+            # Read-only observes the latest committed state on every call.
+            self._refresh_from_disk()
 
         return self._base_data[ek]
 
@@ -230,22 +296,24 @@ class AxisDB:
         self._assert_writable()
         self._assert_key(key)
 
-        # Ensure JSON-serializable by default.
+        # Ensure JSON-serializable by default. Validated with the stdlib: the
+        # faster backends also encode types (datetime, UUID, Enum) that would
+        # not read back as the same value. NaN and Infinity are not JSON.
         try:
-            json.dumps(value)
-        except TypeError as exc:
+            json.dumps(value, allow_nan=False)
+        except (TypeError, ValueError) as exc:
             raise NonJsonSerializableValueError(
                 "Value is not JSON-serializable"
             ) from exc
 
-        ek = encode_key(key)
+        ek = encode_validated_key(key)
         self._overlay_set[ek] = value
         self._overlay_del.discard(ek)
 
     def delete(self, key: tuple[str, ...]) -> None:
         self._assert_writable()
         self._assert_key(key)
-        ek = encode_key(key)
+        ek = encode_validated_key(key)
 
         if ek in self._overlay_set:
             del self._overlay_set[ek]
@@ -253,13 +321,13 @@ class AxisDB:
 
     def exists(self, key: tuple[str, ...]) -> bool:
         self._assert_key(key)
-        ek = encode_key(key)
+        ek = encode_validated_key(key)
         if ek in self._overlay_del:
             return False
         if ek in self._overlay_set:
             return True
         if self.mode == "r":
-            self._reload_base_from_disk()
+            self._refresh_from_disk()
         return ek in self._base_data
 
     # ---------------------------------------------------------------------
@@ -281,12 +349,9 @@ class AxisDB:
             raise ValidationError("prefix longer than number of dimensions")
 
         if self.mode == "r":
-            self._reload_base_from_disk()
+            self._refresh_from_disk()
 
-        keys = self._materialized_keys()
-        if prefix:
-            ep = encode_key(prefix)
-            keys = [k for k in keys if k.startswith(ep + "/") or k == ep]
+        keys = self._live_keys_under_prefix(prefix)
 
         out: list[tuple[str, ...]] = []
         for ek in keys:
@@ -313,12 +378,20 @@ class AxisDB:
         """
 
         if self.mode == "r":
-            self._reload_base_from_disk()
+            self._refresh_from_disk()
 
         selectors = self._normalize_dim_slices(dim_slices)
 
+        # Leading exact-match selectors form a key prefix: range-scan it.
+        leading: list[str] = []
+        for selector in selectors:
+            if not isinstance(selector, str):
+                break
+            leading.append(selector)
+        keys = self._live_keys_under_prefix(tuple(leading))
+
         out: dict[str, Any] = {}
-        for encoded_key in self._materialized_keys():
+        for encoded_key in keys:
             key = decode_key(encoded_key)
             if not self._match_dim_slices(selectors, key):
                 continue
@@ -379,7 +452,7 @@ class AxisDB:
             raise ValidationError("limit must be a positive integer")
 
         if self.mode == "r":
-            self._reload_base_from_disk()
+            self._refresh_from_disk()
 
         candidates = self._candidate_keys(prefix=prefix, where=where)
         results: list[tuple[tuple[str, ...], Any]] = []
@@ -408,16 +481,11 @@ class AxisDB:
         - Uses field index for simple `Field(path) == literal` queries when configured.
         """
 
-        all_keys = self._materialized_keys()
-
-        # Base-only index usage is only safe when there is no overlay.
-        can_use_indexes = (
-            not self._overlay_set and not self._overlay_del and self._base_prefix_keys
-        )
-
-        # 1) Field index (if enabled and query is simple equality)
+        # 1) Field index (if enabled and query is simple equality). Field
+        # indexes describe base data only, so pending writes rule them out.
         if (
-            can_use_indexes
+            not self._overlay_set
+            and not self._overlay_del
             and isinstance(where, Expr)
             and is_simple_field_equality(where)
             and isinstance(where, Field)
@@ -430,32 +498,57 @@ class AxisDB:
                     break
 
             if index_name is not None:
+                self._ensure_indexes()
                 vkey = canonical_value_key(where.value)
                 candidates = self._base_field_indexes.get(index_name, {}).get(vkey, [])
 
-                # Apply prefix restriction on top.
-                if prefix:
-                    ep = encode_key(prefix)
-                    return [k for k in candidates if k.startswith(ep + "/") or k == ep]
-                return list(candidates)
+                # Apply prefix restriction on top (buckets are sorted).
+                return list(self._keys_under_prefix(candidates, prefix))
 
         # 2) Prefix index
-        if prefix:
-            if can_use_indexes:
-                ep = encode_key(prefix)
-                lo, hi = select_prefix_range(self._base_prefix_keys, ep)
-                return self._base_prefix_keys[lo:hi]
+        return self._live_keys_under_prefix(prefix)
+
+    def _keys_under_prefix(
+        self, sorted_keys: list[str], prefix: tuple[str, ...]
+    ) -> list[str]:
+        """Select keys under `prefix` from sorted encoded keys by bisection.
+
+        Matches whole components: prefix ("u1",) selects "u1/..." but not
+        "u10/...".
+        """
 
-            ep = encode_key(prefix)
-            return [k for k in all_keys if k.startswith(ep + "/") or k == ep]
+        if not prefix:
+            return sorted_keys
+        ep = encode_key(prefix)
+        if len(prefix) == self._dimensions:
+            lo = bisect_left(sorted_keys, ep)
+            if lo < len(sorted_keys) and sorted_keys[lo] == ep:
+                return sorted_keys[lo : lo + 1]
+            return []
+        lo, hi = select_prefix_range(sorted_keys, ep + "/")
+        return sorted_keys[lo:hi]
+
+    def _live_keys_under_prefix(self, prefix: tuple[str, ...]) -> list[str]:
+        """Sorted encoded keys under `prefix`, including pending writes.
+
+        Bisects the prefix index, so the cost is O(log n + k) for k matches
+        plus the size of the overlay; the full key set is never sorted.
+        """
 
-        return all_keys
+        base_keys = self._keys_under_prefix(self._base_prefix_keys, prefix)
+        if not self._overlay_set and not self._overlay_del:
+            return base_keys
+        added = sorted(ek for ek in self._overlay_set if ek not in self._base_data)
+        kept = (ek for ek in base_keys if ek not in self._overlay_del)
+        return list(heapq.merge(kept, self._keys_under_prefix(added, prefix)))
 
-    def _materialized_keys(self) -> list[str]:
-        keys = set(self._base_data.keys())
-        keys.difference_update(self._overlay_del)
-        keys.update(self._overlay_set.keys())
-        return sorted(keys)
+    def _ensure_indexes(self) -> None:
+        if not self._indexes_dirty:
+            return
+        self._base_field_indexes = rebuild_field_indexes(
+            self._base_data, self._field_index_defs
+        )
+        self._indexes_dirty = False
 
     def _get_by_encoded_key(self, encoded_key: str) -> Any:
         if encoded_key in self._overlay_del:
@@ -475,33 +568,99 @@ class AxisDB:
         if not self._overlay_set and not self._overlay_del:
             return
 
-        # Build next state.
-        next_data = dict(self._base_data)
-        for ek in self._overlay_del:
-            next_data.pop(ek, None)
-        next_data.update(self._overlay_set)
+        records: list[WalRecord] = [
+            {"op": "del", "key": ek}
+            for ek in sorted(self._overlay_del)
+            if ek in self._base_data
+        ]
+        records.extend(
+            {"op": "set", "key": ek, "value": v} for ek, v in self._overlay_set.items()
+        )
+        encoded = encode_wal_commit(records)
+
+        if self._needs_compaction(len(encoded)):
+            # Build next state.
+            next_data = dict(self._base_data)
+            for ek in self._overlay_del:
+                next_data.pop(ek, None)
+            next_data.update(self._overlay_set)
+            self._write_snapshot(next_data)
+        else:
+            if self.lock:
+                with FileLock(
+                    FileLockSpec(self._lock_paths.rw_lock, LockMode.EXCLUSIVE)
+                ):
+                    append_wal(self._storage_paths, encoded, self._generation)
+            else:
+                append_wal(self._storage_paths, encoded, self._generation)
+            self._update_prefix_keys(records)
+            apply_wal(self._base_data, records)
+            self._indexes_dirty = True
+
+        self._overlay_set.clear()
+        self._overlay_del.clear()
+
+    def _update_prefix_keys(self, records: list[WalRecord]) -> None:
+        """Apply WAL `records` to the prefix keys before they reach base data."""
+
+        keys = self._base_prefix_keys
+        for record in records:
+            ek = record["key"]
+            if record["op"] == "del":
+                keys.pop(bisect_left(keys, ek))
+            elif ek not in self._base_data:
+                insort(keys, ek)
+
+    def compact(self) -> None:
+        """Fold the WAL into the main DB file.
+
+        Pending (uncommitted) writes are left untouched.
+        """
+
+        self._assert_writable()
+        self._write_snapshot(self._base_data)
+
+    def _needs_compaction(self, pending_wal_bytes: int) -> bool:
+        # Older format versions have no WAL; upgrade them on the first commit.
+        if self._format_version != FORMAT_VERSION:
+            return True
+        # Index definitions only live in the snapshot metadata.
+        if self._field_index_defs != self._persisted_field_index_defs:
+            return True
+        try:
+            snapshot_size = self.path.stat().st_size
+        except FileNotFoundError:
+            return True
+        return wal_size(self._storage_paths) + pending_wal_bytes > snapshot_size
 
+    def _write_snapshot(self, next_data: dict[str, Any]) -> None:
         # Rebuild indexes (correctness-first).
         prefix_keys = rebuild_prefix_keys(next_data)
         field_indexes = rebuild_field_indexes(next_data, self._field_index_defs)
 
+        generation = self._generation + 1
         payload = default_payload(dimensions=self._dimensions)
         payload["meta"]["indexes"]["fields"] = self._field_index_defs
+        payload["meta"]["generation"] = generation
         payload["data"] = next_data
         payload["index"] = {"prefix_keys": prefix_keys, "fields": field_indexes}
 
         if self.lock:
             with FileLock(FileLockSpec(self._lock_paths.rw_lock, LockMode.EXCLUSIVE)):
                 write_atomic(self._storage_paths, payload)
+                reset_wal(self._storage_paths, generation)
         else:
             write_atomic(self._storage_paths, payload)
+            reset_wal(self._storage_paths, generation)
 
-        # Refresh base and clear overlay.
+        # Refresh base.
         self._base_data = next_data
         self._base_prefix_keys = prefix_keys
         self._base_field_indexes = field_indexes
-        self._overlay_set.clear()
-        self._overlay_del.clear()
+        self._persisted_field_index_defs = list(self._field_index_defs)
+        self._format_version = FORMAT_VERSION
+        self._generation = generation
+        self._indexes_dirty = False
 
     def rollback(self) -> None:
         if self.mode == "r":
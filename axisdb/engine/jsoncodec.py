@@ -0,0 +1,125 @@
+"""JSON encoding/decoding used by the storage engine.
+
+Backends, in order of preference:
+
+- `orjson` (``pip install "axisdb[speedups]"``).
+- `ujson`, for platforms without orjson wheels. Used for parsing only: its
+  encoder also serializes objects with `__json__` / `toDict` methods,
+  `Decimal` and arbitrary dict keys, and checking for those first costs
+  more than encoding with the stdlib.
+- The standard library `json` module.
+
+All backends produce compact UTF-8 bytes with sorted keys. Values the fast
+backends cannot represent the way the stdlib does (non-finite floats,
+integers beyond 64 bits, non-string keys) are handed to the stdlib, so every
+backend writes and reads the same documents.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on installed extras
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover - depends on installed extras
+    ujson = None  # type: ignore[assignment]
+
+# orjson parses integers outside the 64-bit range as floats, silently losing
+# precision. Any number that long has at least 19 digits; such documents are
+# parsed with the stdlib instead (a long digit run inside a string is a
+# harmless false positive).
+_LONG_DIGITS = re.compile(rb"\d{19}")
+_LONG_DIGITS_STR = re.compile(r"\d{19}")
+
+if orjson is not None:
+    _ORJSON_OPTIONS = (
+        orjson.OPT_SORT_KEYS
+        | orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+
+class _NonFiniteFloat(float):
+    """A `NaN` / `Infinity` read back from a document written by the stdlib.
+
+    orjson cannot write non-finite floats (it silently emits null) and
+    refuses float subclasses, so documents holding these are re-encoded by
+    the stdlib; no scan of the document is needed to find them.
+    """
+
+    __slots__ = ()
+
+
+def _parse_constant(name: str) -> float:
+    return _NonFiniteFloat(name)
+
+
+def _stdlib_dumps(value: Any) -> bytes:
+    return json.dumps(
+        value, separators=(",", ":"), sort_keys=True, ensure_ascii=False
+    ).encode("utf-8")
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize `value` to compact UTF-8 JSON bytes with sorted object keys.
+
+    Integers of any size are written exactly, and non-finite floats parsed by
+    `loads` are written back as `NaN` / `Infinity` / `-Infinity`. Values
+    accepted from users must be validated with the stdlib first (as
+    `AxisDB.set` does): orjson also encodes `UUID` and `Enum` values, and
+    writes non-finite floats that did not come from `loads` as null.
+
+    Raises `TypeError` (or a subclass) when `value` is not JSON-serializable.
+    """
+
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # Types orjson leaves to the stdlib: integers beyond 64 bits, float
+            # subclasses, non-string keys, dates and dataclasses (so that they
+            # are rejected, as by the stdlib), or nesting deeper than orjson
+            # allows.
+            return _stdlib_dumps(value)
+
+    return _stdlib_dumps(value)
+
+
+def accepts_buffers() -> bool:
+    """Whether `loads` can parse a `memoryview` without copying it first."""
+
+    return orjson is not None
+
+
+def loads(data: bytes | str | memoryview) -> Any:
+    """Parse JSON from bytes or str (or a memoryview, see `accepts_buffers`).
+
+    Documents the preferred backend cannot parse exactly (`NaN` literals as
+    written by the stdlib, integers beyond 64 bits) are parsed with the
+    stdlib instead.
+
+    Raises `ValueError` (or a subclass) on malformed input.
+    """
+
+    if orjson is not None:
+        long_digits = _LONG_DIGITS_STR if isinstance(data, str) else _LONG_DIGITS
+        if long_digits.search(data) is None:  # type: ignore[arg-type]
+            try:
+                return orjson.loads(data)
+            except ValueError:
+                pass
+    elif ujson is not None:
+        try:
+            return ujson.loads(data)
+        except ValueError:
+            pass
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data, parse_constant=_parse_constant)
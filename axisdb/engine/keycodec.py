@@ -36,6 +36,16 @@ def encode_key(components: Sequence[str]) -> str:
     return _SEP.join(encode_component(c) for c in components)
 
 
+def encode_validated_key(components: tuple[str, ...]) -> str:
+    """Encode a key whose components are already known to be strings.
+
+    Skips the per-component type checks of `encode_key`; callers must have
+    validated the key themselves.
+    """
+
+    return _SEP.join([quote(c, safe="") for c in components])
+
+
 def decode_key(encoded_key: str) -> tuple[str, ...]:
     if not isinstance(encoded_key, str):
         raise ValidationError("Encoded key must be a string")
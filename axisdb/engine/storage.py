@@ -2,25 +2,41 @@
 
 Design goals:
 
-- Human-inspectable JSON on disk.
-- Atomic commits via temp-file + `os.replace()`.
-- Crash recovery on open by promoting a valid temp file.
+- Human-inspectable JSON on disk (compact; pretty-print with `python -m json.tool`).
+- Atomic snapshots via temp-file + `os.replace()`.
+- Small commits appended to a newline-delimited JSON write-ahead log (WAL)
+  that is replayed on load and folded into the snapshot on compaction.
+  Snapshot and WAL carry a generation number, so a WAL that a snapshot
+  already includes is never replayed onto it.
+- Crash recovery on open by promoting a valid temp file and discarding a
+  torn WAL tail.
 """
 
 from __future__ import annotations
 
-import json
+import mmap
 import os
 from contextlib import suppress
 from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any, TypedDict, cast
+from typing import Any, Literal, TypedDict, cast
 
+from axisdb.engine import jsoncodec
 from axisdb.errors import StorageCorruptionError, ValidationError
 
 FORMAT_NAME = "axisdb"
-FORMAT_VERSION = 2
+FORMAT_VERSION = 3
+# Version 2 files predate the WAL. They are still read (without a WAL) and are
+# rewritten as the current version by the first commit.
+_LEGACY_FORMAT_VERSION = 2
+
+# Files at least this large are memory-mapped for parsing when the JSON codec
+# can read from a buffer, instead of being copied into a bytes object first.
+_MMAP_MIN_BYTES = 1 << 20
+
+# Windows needs O_BINARY for raw descriptor writes; elsewhere it does not exist.
+_O_BINARY = getattr(os, "O_BINARY", 0)
 
 
 def _utc_now_iso() -> str:
@@ -44,6 +60,9 @@ class Meta(TypedDict):
     created_at: str
     updated_at: str
     indexes: IndexMeta
+    # Incremented by every snapshot write; the WAL header names the
+    # generation its commits apply to.
+    generation: int
 
 
 class IndexPayload(TypedDict, total=False):
@@ -59,6 +78,20 @@ class DBPayload(TypedDict):
     index: IndexPayload
 
 
+class WalRecord(TypedDict, total=False):
+    op: Literal["set", "del"]
+    key: str
+    value: Any
+
+
+class WalCommit(TypedDict):
+    ops: list[WalRecord]
+
+
+class WalHeader(TypedDict):
+    generation: int
+
+
 @dataclass(frozen=True)
 class StoragePaths:
     db_path: Path
@@ -67,6 +100,14 @@ class StoragePaths:
     def tmp_path(self) -> Path:
         return self.db_path.with_suffix(self.db_path.suffix + ".tmp")
 
+    @property
+    def wal_path(self) -> Path:
+        return self.db_path.with_suffix(self.db_path.suffix + ".wal")
+
+    @property
+    def wal_tmp_path(self) -> Path:
+        return self.db_path.with_suffix(self.db_path.suffix + ".wal.tmp")
+
 
 def default_payload(dimensions: int) -> DBPayload:
     if dimensions <= 0:
@@ -81,12 +122,43 @@ def default_payload(dimensions: int) -> DBPayload:
             "created_at": now,
             "updated_at": now,
             "indexes": {"prefix": {"enabled": True}, "fields": []},
+            "generation": 0,
         },
         "data": {},
         "index": {"prefix_keys": [], "fields": {}},
     }
 
 
+FileStat = tuple[int, int, int]
+DiskSignature = tuple[FileStat | None, FileStat | None, int | None]
+
+
+def _file_stat(path: Path) -> FileStat | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def disk_signature(paths: StoragePaths) -> DiskSignature:
+    """Return a fingerprint of the committed state of the DB files.
+
+    Inode, size and mtime alone can repeat across a snapshot rewrite (inode
+    reuse, equal sizes, coarse mtimes), so the WAL generation is included:
+    every snapshot write bumps it and every WAL commit grows the WAL, so an
+    unchanged fingerprint means there is nothing new to read.
+
+    Call it under the shared rw lock: it reads the WAL header.
+    """
+
+    return (
+        _file_stat(paths.db_path),
+        _file_stat(paths.wal_path),
+        wal_generation(paths),
+    )
+
+
 def _is_dict(value: Any) -> bool:
     return isinstance(value, dict)
 
@@ -97,7 +169,7 @@ def validate_payload(raw: Any) -> DBPayload:
 
     fmt = raw.get("format")
     ver = raw.get("format_version")
-    if fmt != FORMAT_NAME or ver != FORMAT_VERSION:
+    if fmt != FORMAT_NAME or ver not in (_LEGACY_FORMAT_VERSION, FORMAT_VERSION):
         raise ValidationError("Unsupported DB format or version")
 
     meta = raw.get("meta")
@@ -115,6 +187,12 @@ def validate_payload(raw: Any) -> DBPayload:
         if not isinstance(meta.get(k), str):
             raise ValidationError(f"Missing or invalid meta.{k}")
 
+    if ver == _LEGACY_FORMAT_VERSION:
+        meta["generation"] = 0
+    generation = meta.get("generation")
+    if type(generation) is not int or generation < 0:
+        raise ValidationError("Missing or invalid meta.generation")
+
     indexes = meta.get("indexes")
     if indexes is None:
         indexes = {"prefix": {"enabled": True}, "fields": []}
@@ -143,17 +221,29 @@ def validate_payload(raw: Any) -> DBPayload:
     return cast(DBPayload, raw)
 
 
+def _decode_json(path: Path, data: bytes | memoryview) -> Any:
+    try:
+        return jsoncodec.loads(data)
+    except ValueError as exc:
+        raise StorageCorruptionError(f"Invalid JSON in DB file: {path}") from exc
+
+
 def _read_json(path: Path) -> Any:
     try:
-        text = path.read_text(encoding="utf-8")
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size >= _MMAP_MIN_BYTES and jsoncodec.accepts_buffers():
+                with (
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+                    memoryview(mm) as view,
+                ):
+                    return _decode_json(path, view)
+            data = f.read()
     except FileNotFoundError:
         raise
     except OSError as exc:
         raise StorageCorruptionError(f"Could not read DB file: {path}") from exc
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError as exc:
-        raise StorageCorruptionError(f"Invalid JSON in DB file: {path}") from exc
+    return _decode_json(path, data)
 
 
 def read_validated(path: Path) -> DBPayload:
@@ -167,38 +257,41 @@ def recover_if_needed(paths: StoragePaths) -> None:
     - If main is missing and tmp exists+valid: promote tmp.
     - If main invalid and tmp exists+valid: promote tmp.
     - If main valid and tmp exists: delete tmp.
+    - If the WAL ends in a torn (non newline-terminated) record: truncate it.
+    - If the WAL predates the snapshot (a compaction stopped before resetting
+      it): reset it, so new commits are not appended to a skipped WAL.
     """
 
+    _truncate_torn_wal_tail(paths)
+    with suppress(FileNotFoundError):
+        paths.wal_tmp_path.unlink()
+
     main_exists = paths.db_path.exists()
     tmp_exists = paths.tmp_path.exists()
 
     if not main_exists and not tmp_exists:
         return
 
-    main_ok = False
+    main: DBPayload | None = None
     if main_exists:
-        try:
-            read_validated(paths.db_path)
-            main_ok = True
-        except (ValidationError, StorageCorruptionError):
-            main_ok = False
+        with suppress(ValidationError, StorageCorruptionError):
+            main = read_validated(paths.db_path)
 
-    tmp_ok = False
+    tmp: DBPayload | None = None
     if tmp_exists:
-        try:
-            read_validated(paths.tmp_path)
-            tmp_ok = True
-        except (ValidationError, StorageCorruptionError):
-            tmp_ok = False
+        with suppress(ValidationError, StorageCorruptionError):
+            tmp = read_validated(paths.tmp_path)
 
-    if main_ok:
+    if main is not None:
         if tmp_exists:
             with suppress(OSError):
                 paths.tmp_path.unlink()
+        _reset_stale_wal(paths, main)
         return
 
-    if tmp_ok:
+    if tmp is not None:
         os.replace(paths.tmp_path, paths.db_path)
+        _reset_stale_wal(paths, tmp)
         return
 
     if main_exists:
@@ -234,21 +327,249 @@ def _fsync_dir_best_effort(path: Path) -> None:
         os.close(fd)
 
 
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def _replace_atomic(tmp: Path, dest: Path, *chunks: bytes) -> None:
+    """Write `chunks` to `tmp`, fsync it, and atomically move it over `dest`."""
+
+    tmp.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        # Write straight to the descriptor: no buffered file object, and
+        # chunks are written one by one rather than joined into a copy.
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_BINARY, 0o666)
+        try:
+            for chunk in chunks:
+                _write_all(fd, chunk)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    except OSError as exc:
+        # The write was reported as failed, so recovery must never promote
+        # this temp file.
+        with suppress(OSError):
+            tmp.unlink()
+        raise StorageCorruptionError(f"Failed to write temp file: {tmp}") from exc
+
+    os.replace(tmp, dest)
+    _fsync_dir_best_effort(dest)
+
+
 def write_atomic(paths: StoragePaths, payload: DBPayload) -> None:
     """Write payload to tmp and atomically replace main."""
 
     payload["meta"]["updated_at"] = _utc_now_iso()
+    _replace_atomic(paths.tmp_path, paths.db_path, jsoncodec.dumps(payload), b"\n")
+
+
+# -------------------------------------------------------------------------
+# Write-ahead log
+# -------------------------------------------------------------------------
+
+
+def _encode_wal_header(generation: int) -> bytes:
+    header: WalHeader = {"generation": generation}
+    return jsoncodec.dumps(header) + b"\n"
+
+
+def _validate_wal_header(raw: Any) -> int:
+    generation = raw.get("generation") if _is_dict(raw) else None
+    if type(generation) is not int or generation < 0:
+        raise ValidationError("WAL header must be an object with a generation")
+    return generation
+
+
+def encode_wal_commit(records: list[WalRecord]) -> bytes:
+    """Encode one commit as a single newline-terminated JSON line.
+
+    A commit is one line so that an interrupted append is dropped whole and a
+    commit is never replayed in part.
+    """
+
+    commit: WalCommit = {"ops": records}
+    return jsoncodec.dumps(commit) + b"\n"
+
+
+def _validate_wal_record(raw: Any) -> WalRecord:
+    if not _is_dict(raw) or not isinstance(raw.get("key"), str):
+        raise ValidationError("WAL record must be an object with a string key")
+    op = raw.get("op")
+    if op == "set":
+        if "value" not in raw:
+            raise ValidationError("WAL set record is missing a value")
+    elif op != "del":
+        raise ValidationError(f"Unsupported WAL op: {op!r}")
+    return cast(WalRecord, raw)
 
-    tmp = paths.tmp_path
-    tmp.parent.mkdir(parents=True, exist_ok=True)
 
-    encoded = json.dumps(payload, indent=2, sort_keys=True, ensure_ascii=False) + "\n"
+def _validate_wal_commit(raw: Any) -> list[WalRecord]:
+    if not _is_dict(raw) or not isinstance(raw.get("ops"), list):
+        raise ValidationError("WAL commit must be an object with an ops list")
+    return [_validate_wal_record(op) for op in raw["ops"]]
+
+
+def read_wal(paths: StoragePaths, snapshot: DBPayload) -> list[WalRecord]:
+    """Read the WAL records that apply on top of `snapshot`, in commit order.
+
+    The first line is a header naming the snapshot generation the commits
+    were made against. A WAL from an earlier generation is already part of
+    the snapshot (compaction stopped before resetting it) and is skipped.
+
+    Only newline-terminated lines are committed; a trailing fragment is the
+    remains of an interrupted append and is ignored.
+    """
+
+    if snapshot["format_version"] != FORMAT_VERSION:
+        return []
+
+    try:
+        data = paths.wal_path.read_bytes()
+    except FileNotFoundError:
+        return []
+    except OSError as exc:
+        raise StorageCorruptionError(
+            f"Could not read WAL file: {paths.wal_path}"
+        ) from exc
+
+    lines = data.split(b"\n")[:-1]
+    if not lines:
+        return []
+
+    records: list[WalRecord] = []
+    try:
+        generation = _validate_wal_header(jsoncodec.loads(lines[0]))
+        if generation < snapshot["meta"]["generation"]:
+            return []
+        if generation > snapshot["meta"]["generation"]:
+            raise StorageCorruptionError(
+                f"WAL file is newer than the DB file: {paths.wal_path}"
+            )
+        for line in lines[1:]:
+            records.extend(_validate_wal_commit(jsoncodec.loads(line)))
+    except ValueError as exc:
+        raise StorageCorruptionError(
+            f"Invalid record in WAL file: {paths.wal_path}"
+        ) from exc
+    return records
+
+
+def wal_generation(paths: StoragePaths) -> int | None:
+    """Return the generation named by the WAL header, or None without one."""
+
     try:
-        with open(tmp, "w", encoding="utf-8", newline="\n") as f:
-            f.write(encoded)
-            _fsync_file(f)
+        with open(paths.wal_path, "rb") as f:
+            line = f.readline()
+    except FileNotFoundError:
+        return None
     except OSError as exc:
-        raise StorageCorruptionError(f"Failed to write temp DB file: {tmp}") from exc
+        raise StorageCorruptionError(
+            f"Could not read WAL file: {paths.wal_path}"
+        ) from exc
+    if not line.endswith(b"\n"):
+        return None
+    try:
+        return _validate_wal_header(jsoncodec.loads(line))
+    except ValueError as exc:
+        raise StorageCorruptionError(
+            f"Invalid header in WAL file: {paths.wal_path}"
+        ) from exc
+
 
-    os.replace(tmp, paths.db_path)
-    _fsync_dir_best_effort(paths.db_path)
+def apply_wal(data: dict[str, Any], records: list[WalRecord]) -> None:
+    """Replay WAL records onto `data` in place.
+
+    Replay is idempotent, so records that were already folded into the
+    snapshot (e.g. after a crash during compaction) are harmless.
+    """
+
+    for rec in records:
+        if rec["op"] == "set":
+            data[rec["key"]] = rec["value"]
+        else:
+            data.pop(rec["key"], None)
+
+
+def wal_size(paths: StoragePaths) -> int:
+    try:
+        return paths.wal_path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def append_wal(paths: StoragePaths, encoded: bytes, generation: int) -> None:
+    """Durably append a pre-encoded commit to the WAL of `generation`.
+
+    The header is written first when the WAL is new or empty. On failure the
+    WAL is truncated back to its previous length so that a partial append
+    cannot corrupt later records.
+    """
+
+    wal = paths.wal_path
+    created = not wal.exists()
+    try:
+        # Unbuffered: a failed write leaves nothing pending in a buffer, so
+        # the truncate below really restores the previous length.
+        fd = os.open(wal, os.O_WRONLY | os.O_CREAT | os.O_APPEND | _O_BINARY, 0o666)
+        try:
+            start = os.lseek(fd, 0, os.SEEK_END)
+            if start == 0:
+                encoded = _encode_wal_header(generation) + encoded
+            try:
+                _write_all(fd, encoded)
+                os.fsync(fd)
+            except OSError:
+                with suppress(OSError):
+                    os.ftruncate(fd, start)
+                raise
+        finally:
+            os.close(fd)
+    except OSError as exc:
+        raise StorageCorruptionError(f"Failed to append to WAL file: {wal}") from exc
+
+    if created:
+        _fsync_dir_best_effort(wal)
+
+
+def clear_wal(paths: StoragePaths) -> None:
+    """Remove the WAL (used when a new database replaces an old one)."""
+
+    with suppress(FileNotFoundError):
+        paths.wal_path.unlink()
+
+
+def reset_wal(paths: StoragePaths, generation: int) -> None:
+    """Atomically replace the WAL with an empty one for `generation`.
+
+    Called once a snapshot of `generation` includes every earlier commit.
+    """
+
+    _replace_atomic(paths.wal_tmp_path, paths.wal_path, _encode_wal_header(generation))
+
+
+def _reset_stale_wal(paths: StoragePaths, snapshot: DBPayload) -> None:
+    if snapshot["format_version"] != FORMAT_VERSION:
+        return
+    generation = wal_generation(paths)
+    if generation is not None and generation < snapshot["meta"]["generation"]:
+        reset_wal(paths, snapshot["meta"]["generation"])
+
+
+def _truncate_torn_wal_tail(paths: StoragePaths) -> None:
+    try:
+        data = paths.wal_path.read_bytes()
+    except FileNotFoundError:
+        return
+    except OSError as exc:
+        raise StorageCorruptionError(
+            f"Could not read WAL file: {paths.wal_path}"
+        ) from exc
+
+    end = data.rfind(b"\n") + 1
+    if end == len(data):
+        return
+    with open(paths.wal_path, "r+b") as f:
+        f.truncate(end)
+        _fsync_file(f)
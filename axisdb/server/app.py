@@ -3,16 +3,25 @@
 This is intentionally a thin layer:
 - It does not implement database logic.
 - It converts HTTP requests into calls to [`AxisDB`](axisdb/api.py:1).
+
+Route handlers that touch a database are plain `def` functions on purpose:
+they take file locks (which may wait) and do blocking file IO, so they must
+run in the FastAPI threadpool rather than on the event loop.
 """
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
 from fastapi import Body, FastAPI, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
 
 from axisdb import AxisDB
+from axisdb.engine import jsoncodec
+from axisdb.engine.locking import FileLock, FileLockSpec, LockMode, LockPaths
+from axisdb.engine.storage import DiskSignature, StoragePaths, disk_signature
 from axisdb.errors import (
     LockError,
     ReadOnlyError,
@@ -20,10 +29,38 @@ from axisdb.errors import (
     ValidationError,
 )
 from axisdb.query.ast import Field
-from axisdb.server.schemas import DeleteBody, InitResponse, ItemBody
+from axisdb.server.cache import ResponseCache
+from axisdb.server.schemas import (
+    MAX_COORDS,
+    DeleteBody,
+    FindResponse,
+    InfoResponse,
+    InitResponse,
+    ItemBody,
+    ItemResponse,
+    ItemsBody,
+    ListResponse,
+    SliceResponse,
+)
 
 app = FastAPI(title="AxisDB")
 
+# /info only changes when a database file is replaced, so its encoded body is
+# served from cache while the file fingerprint is unchanged.
+_info_cache = ResponseCache(max_entries=256, max_bytes=1 << 20)
+
+# Encoded /slice bodies keyed by (path, prefix), under the same fingerprint
+# rule. Slices over _SLICE_CACHE_MAX_BYTES are streamed every time rather than
+# held in memory, and the cache as a whole is bounded by total size as well.
+_slice_cache = ResponseCache(max_entries=128, max_bytes=16 << 20)
+_SLICE_CACHE_MAX_BYTES = 1 << 20
+
+# Each streamed chunk is a separate threadpool hop and ASGI message, so /slice
+# entries are batched rather than sent one at a time.
+_SLICE_CHUNK_BYTES = 64 << 10
+
+_ROOT_BODY = jsoncodec.dumps({"message": "AxisDB API. See /docs for Swagger UI."})
+
 
 def _to_http(exc: Exception) -> HTTPException:
     if isinstance(exc, (ValidationError, ReadOnlyError)):
@@ -37,11 +74,42 @@ def _to_http(exc: Exception) -> HTTPException:
     return HTTPException(status_code=500, detail=str(exc))
 
 
-@app.get("/info")
-def info(path: str) -> dict[str, Any]:
+def _disk_signature(path: str) -> DiskSignature:
+    # Taken under the shared rw lock, as AxisDB reads do: it reads the WAL
+    # header, which must not be held open while a commit replaces the file.
+    with FileLock(FileLockSpec(LockPaths(Path(path)).rw_lock, LockMode.SHARED)):
+        return disk_signature(StoragePaths(db_path=Path(path)))
+
+
+def _json_response(payload: Any) -> Response:
+    """Encode `payload` once with the storage codec and return it as-is.
+
+    Used for responses carrying stored documents, bypassing FastAPI's
+    response-model validation and serialization; the route's `response_model`
+    then only documents the body in the OpenAPI schema.
+    """
+
+    return Response(content=jsoncodec.dumps(payload), media_type="application/json")
+
+
+@app.get("/", include_in_schema=False)
+async def root() -> Response:
+    # Constant body, no IO: serve pre-encoded bytes straight from the event loop.
+    return Response(content=_ROOT_BODY, media_type="application/json")
+
+
+@app.get("/info", response_model=InfoResponse)
+def info(path: str) -> Response:
     try:
-        db = AxisDB.open(path, mode="r")
-        return {"path": str(Path(path)), "dimensions": db.dimensions, "mode": "r"}
+        signature = _disk_signature(path)
+        body = _info_cache.get(path, signature)
+        if body is None:
+            db = AxisDB.open(path, mode="r")
+            body = jsoncodec.dumps(
+                {"path": str(Path(path)), "dimensions": db.dimensions, "mode": "r"}
+            )
+            _info_cache.put(path, signature, body)
+        return Response(content=body, media_type="application/json")
     except Exception as exc:  # noqa: BLE001
         raise _to_http(exc) from exc
 
@@ -70,12 +138,28 @@ def set_item(path: str, body: ItemBody = Body(...)) -> dict[str, Any]:
         raise _to_http(exc) from exc
 
 
-@app.get("/item")
-def get_item(path: str, coords: list[str] = Query(...)) -> dict[str, Any]:
+@app.post("/items")
+def set_items(path: str, body: ItemsBody = Body(...)) -> dict[str, Any]:
+    """Write many items with a single commit."""
+
+    try:
+        with AxisDB.open(path, mode="rw") as db:
+            for item in body.items:
+                db.set(tuple(item.coords), item.value)
+            db.commit()
+        return {"count": len(body.items)}
+    except Exception as exc:  # noqa: BLE001
+        raise _to_http(exc) from exc
+
+
+@app.get("/item", response_model=ItemResponse)
+def get_item(
+    path: str, coords: list[str] = Query(..., min_length=1, max_length=MAX_COORDS)
+) -> Response:
     try:
         db = AxisDB.open(path, mode="r")
         value = db.get(tuple(coords))
-        return {"coords": coords, "value": value}
+        return _json_response({"coords": coords, "value": value})
     except Exception as exc:  # noqa: BLE001
         raise _to_http(exc) from exc
 
@@ -91,27 +175,112 @@ def delete_item(path: str, body: DeleteBody = Body(...)) -> dict[str, Any]:
         raise _to_http(exc) from exc
 
 
-@app.get("/list")
+@app.get("/list", response_model=ListResponse)
 def list_items(
-    path: str, prefix: list[str] | None = None, depth: int | None = None
-) -> dict[str, Any]:
+    path: str,
+    prefix: list[str] | None = Query(None, max_length=MAX_COORDS),
+    depth: int | None = None,
+) -> Response:
     try:
         db = AxisDB.open(path, mode="r")
         keys = db.list(prefix=tuple(prefix or ()), depth=depth)
-        return {"keys": [list(k) for k in keys]}
+        return _json_response({"keys": keys})
+    except Exception as exc:  # noqa: BLE001
+        raise _to_http(exc) from exc
+
+
+@app.get("/slice", response_model=SliceResponse)
+def slice_items(
+    path: str, prefix: list[str] | None = Query(None, max_length=MAX_COORDS)
+) -> Response:
+    """Nested slice of all items under an exact-match key prefix.
+
+    The entries under the prefix are streamed in batches of about 64 KiB, so
+    a large slice is never encoded into a single buffer. Small bodies are
+    cached until the database files change.
+    """
+
+    cache_key = (path, tuple(prefix or ()))
+    try:
+        signature = _disk_signature(path)
+        body = _slice_cache.get(cache_key, signature)
+        if body is not None:
+            return Response(content=body, media_type="application/json")
+        db = AxisDB.open(path, mode="r")
+        data = db.slice(tuple(prefix or ()))
     except Exception as exc:  # noqa: BLE001
         raise _to_http(exc) from exc
+    chunks = _stream_slice(prefix or [], data)
+    return StreamingResponse(
+        _cache_stream(chunks, cache_key, signature), media_type="application/json"
+    )
+
+
+def _stream_slice(prefix: list[str], data: dict[str, Any]) -> Iterator[bytes]:
+    """Encode a /slice body in chunks of roughly `_SLICE_CHUNK_BYTES`.
+
+    Every level of `data` down to the prefix has a single key, so the entries
+    streamed are those under the prefix node rather than the root.
+    """
+
+    head = b'{"prefix":' + jsoncodec.dumps(prefix) + b',"data":'
+    node: Any = data
+    depth = 0
+    while depth < len(prefix) and isinstance(node, dict) and prefix[depth] in node:
+        head += b"{" + jsoncodec.dumps(prefix[depth]) + b":"
+        node = node[prefix[depth]]
+        depth += 1
+    tail = b"}" * (depth + 1)
+    if not isinstance(node, dict):
+        # The prefix names a full key: a single value.
+        yield head + jsoncodec.dumps(node) + tail
+        return
+
+    buf = bytearray(head + b"{")
+    sep = b""
+    for k, v in node.items():
+        buf += sep + jsoncodec.dumps(k) + b":" + jsoncodec.dumps(v)
+        sep = b","
+        if len(buf) >= _SLICE_CHUNK_BYTES:
+            yield bytes(buf)
+            buf.clear()
+    buf += b"}" + tail
+    yield bytes(buf)
+
+
+def _cache_stream(
+    chunks: Iterator[bytes], cache_key: tuple[Any, ...], signature: DiskSignature
+) -> Iterator[bytes]:
+    """Pass `chunks` through, caching the full body if it stays small.
+
+    `signature` is taken before the database is read, so a commit that lands
+    in between only makes the entry look stale, never fresh.
+    """
+
+    parts: list[bytes] | None = []
+    size = 0
+    for chunk in chunks:
+        yield chunk
+        if parts is None:
+            continue
+        size += len(chunk)
+        if size > _SLICE_CACHE_MAX_BYTES:
+            parts = None
+        else:
+            parts.append(chunk)
+    if parts is not None:
+        _slice_cache.put(cache_key, signature, b"".join(parts))
 
 
-@app.get("/find")
+@app.get("/find", response_model=FindResponse)
 def find_items(
     path: str,
-    prefix: list[str] | None = None,
-    field: list[str] | None = None,
+    prefix: list[str] | None = Query(None, max_length=MAX_COORDS),
+    field: list[str] | None = Query(None),
     op: str = "==",
     value: Any = None,
     limit: int | None = None,
-) -> dict[str, Any]:
+) -> Response:
     """Minimal query endpoint.
 
     MVP: supports a single field predicate.
@@ -123,6 +292,6 @@ def find_items(
         if field is not None:
             expr = Field(tuple(field), op, value)  # type: ignore[arg-type]
         rows = db.find(prefix=tuple(prefix or ()), where=expr, limit=limit)
-        return {"rows": [{"key": list(k), "value": v} for k, v in rows]}
+        return _json_response({"rows": [{"key": k, "value": v} for k, v in rows]})
     except Exception as exc:  # noqa: BLE001
         raise _to_http(exc) from exc
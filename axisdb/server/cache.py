@@ -0,0 +1,64 @@
+"""In-process cache of pre-encoded response bodies for the FastAPI wrapper."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+
+from axisdb.engine.storage import DiskSignature
+
+
+class ResponseCache:
+    """Bounded LRU of encoded JSON bodies, tied to a DB file fingerprint.
+
+    Holds at most `max_entries` bodies totalling at most `max_bytes`; a body
+    larger than `max_bytes` on its own is not cached. An entry is only served
+    while the database files still have the fingerprint they had when the
+    body was computed, so commits from any process invalidate it without
+    explicit bookkeeping.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._size = 0
+        self._entries: OrderedDict[Hashable, tuple[DiskSignature, bytes]] = (
+            OrderedDict()
+        )
+        # Route handlers run in a threadpool.
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, signature: DiskSignature) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != signature:
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: Hashable, signature: DiskSignature, body: bytes) -> None:
+        with self._lock:
+            self._discard(key)
+            if len(body) > self._max_bytes:
+                return
+            self._entries[key] = (signature, body)
+            self._size += len(body)
+            while (
+                len(self._entries) > self._max_entries or self._size > self._max_bytes
+            ):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _discard(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
@@ -6,6 +6,16 @@ from typing import Any
 
 from pydantic import BaseModel, Field
 
+# Upper bound on coordinate components accepted over HTTP. Rejecting oversized
+# key lists during validation avoids materializing them per request.
+MAX_COORDS = 64
+
+
+class InfoResponse(BaseModel):
+    path: str
+    dimensions: int
+    mode: str
+
 
 class InitResponse(BaseModel):
     path: str
@@ -13,10 +23,42 @@ class InitResponse(BaseModel):
     created: bool
 
 
+class ItemResponse(BaseModel):
+    coords: list[str]
+    value: Any
+
+
+class ListResponse(BaseModel):
+    keys: list[list[str]]
+
+
+class SliceResponse(BaseModel):
+    prefix: list[str]
+    data: dict[str, Any]
+
+
+class FindRow(BaseModel):
+    key: list[str]
+    value: Any
+
+
+class FindResponse(BaseModel):
+    rows: list[FindRow]
+
+
 class ItemBody(BaseModel):
-    coords: list[str] = Field(..., description="N-dimensional coordinate key")
+    coords: list[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_COORDS,
+        description="N-dimensional coordinate key",
+    )
     value: Any
 
 
+class ItemsBody(BaseModel):
+    items: list[ItemBody] = Field(..., description="Items written in a single commit")
+
+
 class DeleteBody(BaseModel):
-    coords: list[str]
+    coords: list[str] = Field(..., min_length=1, max_length=MAX_COORDS)
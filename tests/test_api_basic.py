@@ -1,10 +1,16 @@
-from __future__ import annotations
-
+import enum
+import json
+import math
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
 from pathlib import Path
 
 import pytest
 
-from axisdb import AxisDB
+from axisdb import AxisDB, api
+from axisdb.engine import storage
+from axisdb.engine.storage import DBPayload
 from axisdb.errors import (
     InvalidCoordsError,
     NonJsonSerializableValueError,
@@ -51,6 +57,72 @@ def test_set_rejects_non_json_serializable_value(tmp_path: Path) -> None:
         db.set(("a",), {"x": {1, 2, 3}})
 
 
+def test_set_rejects_non_finite_floats(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.json"
+    db = AxisDB.create(db_path, dimensions=1)
+    for value in (float("nan"), {"x": [float("inf")]}, -float("inf")):
+        with pytest.raises(NonJsonSerializableValueError):
+            db.set(("a",), value)
+
+
+class _Color(enum.Enum):
+    RED = "red"
+
+
+@dataclass
+class _Point:
+    x: int
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"when": datetime(2024, 1, 1)},
+        {"day": date(2024, 1, 1)},
+        {"id": uuid.UUID(int=1)},
+        {"color": _Color.RED},
+        _Point(1),
+        {date(2024, 1, 1): 1},
+    ],
+)
+def test_set_rejects_values_the_stdlib_cannot_encode(
+    tmp_path: Path, value: object
+) -> None:
+    db_path = tmp_path / "db.json"
+    db = AxisDB.create(db_path, dimensions=1)
+    db.define_field_index("by_when", ("when",))
+    with pytest.raises(NonJsonSerializableValueError):
+        db.set(("a",), value)
+    db.commit()
+
+
+def test_integers_beyond_64_bits_roundtrip(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.json"
+    db = AxisDB.create(db_path, dimensions=1)
+    db.set(("a",), {"n": 2**70, "m": -(2**70)})
+    db.commit()
+    db.compact()
+
+    ro = AxisDB.open(db_path, mode="r")
+    assert ro.get(("a",)) == {"n": 2**70, "m": -(2**70)}
+
+
+def test_opens_file_with_nan_written_by_stdlib_json(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.json"
+    payload = storage.default_payload(dimensions=1)
+    payload["data"] = {"a": float("nan"), "b": 1}
+    # Earlier releases wrote the file with the stdlib, which emits NaN.
+    db_path.write_text(json.dumps(payload, indent=2))
+
+    with AxisDB.open(db_path) as db:
+        assert math.isnan(db.get(("a",)))
+        db.set(("c",), None)
+        db.commit()
+        db.compact()
+
+    assert math.isnan(AxisDB.open(db_path, mode="r").get(("a",)))
+
+
 def test_rejects_wrong_dimension_length(tmp_path: Path) -> None:
     db_path = tmp_path / "db.json"
     db = AxisDB.create(db_path, dimensions=2)
@@ -91,3 +163,101 @@ def test_find_with_field_predicate(tmp_path: Path) -> None:
     expr = Field(("customer_id",), "==", "c2")
     rows = db.find(prefix=("k",), where=expr)
     assert rows == [(("k", "2"), {"customer_id": "c2", "amount": 20})]
+
+
+def test_prefix_matches_whole_components(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.json"
+    db = AxisDB.create(db_path, dimensions=2)
+    db.set(("u1", "a"), 1)
+    db.set(("u10", "b"), 2)
+    db.commit()
+    db.compact()
+
+    assert db.list(prefix=("u1",)) == [("u1", "a")]
+    assert db.find(prefix=("u1",)) == [(("u1", "a"), 1)]
+    assert db.slice(("u1",)) == {"u1": {"a": 1}}
+    assert db.find(prefix=("u1", "a")) == [(("u1", "a"), 1)]
+    assert db.find(prefix=("u1", "b")) == []
+
+
+def test_read_only_skips_reload_until_files_change(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    db_path = tmp_path / "db.json"
+    db = AxisDB.create(db_path, dimensions=1)
+    db.set(("a",), 1)
+    db.commit()
+
+    ro = AxisDB.open(db_path, mode="r")
+    reads: list[Path] = []
+    original = api.read_validated
+
+    def _counting_read(path: Path) -> DBPayload:
+        reads.append(path)
+        return original(path)
+
+    monkeypatch.setattr(api, "read_validated", _counting_read)
+
+    assert ro.get(("a",)) == 1
+    assert ro.list() == [("a",)]
+    assert reads == []
+
+    db.set(("a",), 2)
+    db.commit()
+    assert ro.get(("a",)) == 2
+    assert len(reads) == 1
+
+    db.compact()
+    assert ro.get(("a",)) == 2
+    assert len(reads) == 2
+
+
+def test_read_only_sees_snapshot_commit_with_identical_file_stats(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    db_path = tmp_path / "db.json"
+    db = AxisDB.create(db_path, dimensions=1)
+    db.set(("a",), "x" * 10_000)
+    db.commit()
+    ro = AxisDB.open(db_path, mode="r")
+    assert ro.get(("a",)) == "x" * 10_000
+
+    # Inode reuse, an equal size and a coarse mtime can all repeat.
+    monkeypatch.setattr(storage, "_file_stat", lambda path: (1, 1, 1))
+    ro._loaded_signature = storage.disk_signature(storage.StoragePaths(db_path))
+
+    # Large enough to be written as a new snapshot rather than a WAL append.
+    db.set(("a",), "y" * 20_000)
+    db.commit()
+    assert ro.get(("a",)) == "y" * 20_000
+
+
+def test_prefix_keys_follow_wal_commits_without_rebuild(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    db_path = tmp_path / "db.json"
+    db = AxisDB.create(db_path, dimensions=2)
+    db.set(("u1", "a"), 1)
+    db.set(("u1", "c"), 3)
+    db.set(("u2", "a"), 4)
+    db.commit()
+    db.compact()
+
+    def _no_rebuild(data: dict[str, object]) -> list[str]:
+        raise AssertionError("prefix keys rebuilt in full")
+
+    monkeypatch.setattr(api, "rebuild_prefix_keys", _no_rebuild)
+
+    db.set(("u1", "b"), 2)
+    db.delete(("u1", "c"))
+    db.commit()
+    assert db._base_prefix_keys == sorted(db._base_data)
+
+    # Pending writes are merged into the prefix range.
+    db.set(("u1", "d"), 5)
+    db.delete(("u1", "a"))
+    db.set(("u3", "a"), 6)
+    assert db.list(prefix=("u1",)) == [("u1", "b"), ("u1", "d")]
+    assert db.find(prefix=("u1",)) == [(("u1", "b"), 2), (("u1", "d"), 5)]
+    assert db.slice(("u1",)) == {"u1": {"b": 2, "d": 5}}
+    assert db.list() == [("u1", "b"), ("u1", "d"), ("u2", "a"), ("u3", "a")]
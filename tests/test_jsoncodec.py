@@ -0,0 +1,105 @@
+import json
+import math
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from types import ModuleType
+
+import pytest
+
+from axisdb.engine import jsoncodec
+
+_BACKENDS = ("orjson", "ujson", "json")
+
+
+@pytest.fixture(params=_BACKENDS)
+def codec(
+    request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+) -> ModuleType:
+    # Disable every backend preferred over the one under test.
+    for name in _BACKENDS[: _BACKENDS.index(request.param)]:
+        monkeypatch.setattr(jsoncodec, name, None)
+    if getattr(jsoncodec, request.param) is None:
+        pytest.skip(f"{request.param} not installed")
+    return jsoncodec
+
+
+def test_dumps_loads_roundtrip(codec: ModuleType) -> None:
+    doc = {"b": [1, 2.5, None, True], "a": {"ü": "ß/x"}}
+    encoded = codec.dumps(doc)
+    assert isinstance(encoded, bytes)
+    assert codec.loads(encoded) == doc
+    assert json.loads(encoded.decode("utf-8")) == doc
+
+
+def test_dumps_sorts_keys(codec: ModuleType) -> None:
+    assert codec.dumps({"b": 1, "a": 2}) == b'{"a":2,"b":1}'
+
+
+class _WithJson:
+    def __json__(self) -> str:
+        return '"x"'
+
+
+class _WithToDict:
+    def toDict(self) -> dict[str, int]:  # noqa: N802 - the name ujson looks for
+        return {"x": 1}
+
+
+@dataclass
+class _Point:
+    x: int
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        {"x": {1, 2, 3}},
+        {"x": _WithJson()},
+        {"x": _WithToDict()},
+        {"x": Decimal("1.5")},
+        {"x": datetime(2024, 1, 1)},
+        {"x": _Point(1)},
+        {(1, 2): "tuple key"},
+        {date(2024, 1, 1): "date key"},
+    ],
+)
+def test_dumps_rejects_non_serializable(codec: ModuleType, value: object) -> None:
+    # Every backend accepts exactly what the stdlib accepts.
+    with pytest.raises(TypeError):
+        json.dumps(value)
+    with pytest.raises(TypeError):
+        codec.dumps(value)
+
+
+def test_dumps_writes_non_string_keys_like_stdlib(codec: ModuleType) -> None:
+    assert codec.dumps({2: "b", 1: "a"}) == b'{"1":"a","2":"b"}'
+
+
+def test_loads_rejects_invalid_json(codec: ModuleType) -> None:
+    with pytest.raises(ValueError):
+        codec.loads(b"{not json")
+
+
+def test_non_finite_floats_roundtrip_as_written_by_stdlib(codec: ModuleType) -> None:
+    # Documents written by earlier releases (stdlib json) may hold these.
+    encoded = b'{"a":NaN,"b":[Infinity,-Infinity],"c":null}'
+    doc = codec.loads(encoded)
+    assert math.isnan(doc["a"])
+    assert doc["b"] == [float("inf"), -float("inf")]
+    assert codec.dumps(doc) == encoded
+    assert codec.dumps({"x": doc["b"], "y": "nullable"}) == (
+        b'{"x":[Infinity,-Infinity],"y":"nullable"}'
+    )
+
+
+@pytest.mark.parametrize("number", [2**64, 2**70, -(2**70), 10**30])
+def test_integers_beyond_64_bits_roundtrip_exactly(
+    codec: ModuleType, number: int
+) -> None:
+    encoded = codec.dumps({"n": number})
+    assert encoded == b'{"n":' + str(number).encode() + b"}"
+    assert codec.loads(encoded) == {"n": number}
+    assert codec.loads(encoded.decode("utf-8")) == {"n": number}
+    if codec.accepts_buffers():
+        assert codec.loads(memoryview(encoded)) == {"n": number}
@@ -1,8 +1,6 @@
-from __future__ import annotations
-
 import pytest
 
-from axisdb.engine.keycodec import decode_key, encode_key
+from axisdb.engine.keycodec import decode_key, encode_key, encode_validated_key
 from axisdb.errors import ValidationError
 
 
@@ -18,6 +16,7 @@ from axisdb.errors import ValidationError
 )
 def test_encode_decode_roundtrip(components: tuple[str, ...]) -> None:
     assert decode_key(encode_key(components)) == components
+    assert encode_validated_key(components) == encode_key(components)
 
 
 def test_decode_empty_string_is_empty_tuple() -> None:
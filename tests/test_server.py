@@ -0,0 +1,269 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from axisdb import AxisDB
+from axisdb.engine import jsoncodec
+from axisdb.server import app as server_app
+from axisdb.server.app import app
+from axisdb.server.cache import ResponseCache
+from axisdb.server.schemas import MAX_COORDS
+
+_CRUD_COORDS = ("u1", "orders")
+_CRUD_DELETE_BODY = jsoncodec.dumps({"coords": list(_CRUD_COORDS)})
+_JSON_HEADERS = {"content-type": "application/json"}
+
+
+def _item_params(path: str, coords: tuple[str, ...]) -> list[tuple[str, str]]:
+    """Query params for GET /item: the path plus one `coords` entry per component."""
+
+    return [("path", path)] + [("coords", c) for c in coords]
+
+
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    # Entering the client once keeps a single event-loop portal open for the
+    # whole session instead of starting one per request. Per-test state lives
+    # in each test's own tmp_path database.
+    with TestClient(app) as c:
+        yield c
+
+
+def _init_db(client: TestClient, directory: Path) -> str:
+    path = str(directory / "db.json")
+    resp = client.post("/init", params={"path": path, "dimensions": 2})
+    assert resp.status_code == 200
+    return path
+
+
+@pytest.fixture
+def db_path(tmp_path: Path, client: TestClient) -> str:
+    return _init_db(client, tmp_path)
+
+
+@pytest.fixture(scope="module")
+def shared_db_path(tmp_path_factory: pytest.TempPathFactory, client: TestClient) -> str:
+    """An empty database initialized once for tests that never write to it."""
+
+    return _init_db(client, tmp_path_factory.mktemp("shared"))
+
+
+def test_init_and_info(client: TestClient, shared_db_path: str) -> None:
+    resp = client.get("/info", params={"path": shared_db_path})
+    assert resp.status_code == 200
+    assert resp.json()["dimensions"] == 2
+
+
+def test_init_rejects_existing_database(
+    client: TestClient, shared_db_path: str
+) -> None:
+    resp = client.post("/init", params={"path": shared_db_path, "dimensions": 2})
+    assert resp.status_code == 400
+
+
+def test_item_crud(client: TestClient, db_path: str) -> None:
+    coords = list(_CRUD_COORDS)
+    params = _item_params(db_path, _CRUD_COORDS)
+
+    resp = client.post(
+        "/item", params={"path": db_path}, json={"coords": coords, "value": 3}
+    )
+    assert resp.status_code == 200
+
+    resp = client.get("/item", params=params)
+    assert resp.status_code == 200
+    assert resp.json() == {"coords": coords, "value": 3}
+
+    resp = client.request(
+        "DELETE",
+        "/item",
+        params={"path": db_path},
+        content=_CRUD_DELETE_BODY,
+        headers=_JSON_HEADERS,
+    )
+    assert resp.status_code == 200
+
+    resp = client.get("/item", params=params)
+    assert resp.status_code == 404
+
+
+def test_item_rejects_wrong_dimension_length(
+    client: TestClient, shared_db_path: str
+) -> None:
+    resp = client.get("/item", params=_item_params(shared_db_path, ("only_one",)))
+    assert resp.status_code == 400
+
+
+def test_set_items_commits_batch(client: TestClient, db_path: str) -> None:
+    items = [{"coords": ["u1", str(i)], "value": i} for i in range(5)]
+    resp = client.post("/items", params={"path": db_path}, json={"items": items})
+    assert resp.status_code == 200
+    assert resp.json() == {"count": 5}
+
+    db = AxisDB.open(db_path, mode="r")
+    assert db.get(("u1", "3")) == 3
+
+
+def test_list_and_find(client: TestClient, db_path: str) -> None:
+    items = [
+        {"coords": ["k", "1"], "value": {"customer_id": "c1"}},
+        {"coords": ["k", "2"], "value": {"customer_id": "c2"}},
+        {"coords": ["j", "1"], "value": {"customer_id": "c2"}},
+    ]
+    client.post("/items", params={"path": db_path}, json={"items": items})
+
+    resp = client.get("/list", params={"path": db_path, "prefix": "k"})
+    assert resp.json() == {"keys": [["k", "1"], ["k", "2"]]}
+
+    resp = client.get(
+        "/find",
+        params={"path": db_path, "prefix": "k", "field": "customer_id", "value": "c2"},
+    )
+    assert resp.json() == {
+        "rows": [{"key": ["k", "2"], "value": {"customer_id": "c2"}}]
+    }
+
+
+def test_item_rejects_oversized_coords(client: TestClient, shared_db_path: str) -> None:
+    resp = client.post(
+        "/item",
+        params={"path": shared_db_path},
+        json={"coords": ["c"] * (MAX_COORDS + 1), "value": 1},
+    )
+    assert resp.status_code == 422
+
+    coords = tuple(f"c{i}" for i in range(MAX_COORDS + 1))
+    resp = client.get("/item", params=_item_params(shared_db_path, coords))
+    assert resp.status_code == 422
+    assert resp.json()["detail"][0]["type"] == "too_long"
+
+
+def test_slice_streams_nested_data(client: TestClient, db_path: str) -> None:
+    items = [
+        {"coords": ["u1", "a"], "value": {"v": 1}},
+        {"coords": ["u1", "b"], "value": 2},
+        {"coords": ["u2", "a"], "value": 3},
+    ]
+    client.post("/items", params={"path": db_path}, json={"items": items})
+
+    resp = client.get("/slice", params={"path": db_path, "prefix": "u1"})
+    assert resp.status_code == 200
+    assert resp.json() == {"prefix": ["u1"], "data": {"u1": {"a": {"v": 1}, "b": 2}}}
+
+    resp = client.get("/slice", params={"path": db_path})
+    assert resp.json()["data"] == {"u1": {"a": {"v": 1}, "b": 2}, "u2": {"a": 3}}
+
+
+def test_slice_cache_follows_commits(client: TestClient, db_path: str) -> None:
+    params = {"path": db_path, "prefix": "u1"}
+    client.post(
+        "/item", params={"path": db_path}, json={"coords": ["u1", "a"], "value": 1}
+    )
+
+    first = client.get("/slice", params=params)
+    assert client.get("/slice", params=params).content == first.content
+
+    client.post(
+        "/item", params={"path": db_path}, json={"coords": ["u1", "b"], "value": 2}
+    )
+    resp = client.get("/slice", params=params)
+    assert resp.json()["data"] == {"u1": {"a": 1, "b": 2}}
+
+
+def test_slice_rejects_prefix_longer_than_dimensions(
+    client: TestClient, shared_db_path: str
+) -> None:
+    resp = client.get(
+        "/slice", params={"path": shared_db_path, "prefix": ["a", "b", "c"]}
+    )
+    assert resp.status_code == 400
+
+
+def test_info_reflects_reinitialized_database(client: TestClient, db_path: str) -> None:
+    assert client.get("/info", params={"path": db_path}).json()["dimensions"] == 2
+    assert client.get("/info", params={"path": db_path}).json()["dimensions"] == 2
+
+    resp = client.post(
+        "/init", params={"path": db_path, "dimensions": 3, "overwrite": True}
+    )
+    assert resp.status_code == 200
+    assert client.get("/info", params={"path": db_path}).json()["dimensions"] == 3
+
+
+def test_info_for_missing_database_is_an_error(
+    client: TestClient, tmp_path: Path
+) -> None:
+    resp = client.get("/info", params={"path": str(tmp_path / "missing.json")})
+    assert resp.status_code == 500
+
+
+def test_root_points_to_docs(client: TestClient) -> None:
+    resp = client.get("/")
+    assert resp.status_code == 200
+    assert "/docs" in resp.json()["message"]
+
+
+def test_openapi_documents_read_responses(client: TestClient) -> None:
+    paths = client.get("/openapi.json").json()["paths"]
+    for route, model in [
+        ("/item", "ItemResponse"),
+        ("/list", "ListResponse"),
+        ("/slice", "SliceResponse"),
+        ("/find", "FindResponse"),
+    ]:
+        content = paths[route]["get"]["responses"]["200"]["content"]
+        schema = content["application/json"]["schema"]
+        assert schema == {"$ref": f"#/components/schemas/{model}"}
+
+
+def test_response_cache_is_bounded_by_total_bytes() -> None:
+    signature = (None, None, None)
+    cache = ResponseCache(max_entries=10, max_bytes=10)
+    cache.put("a", signature, b"aaaa")
+    cache.put("b", signature, b"bbbb")
+    assert cache.get("a", signature) == b"aaaa"
+
+    # Over the byte budget: the least recently used entry goes first.
+    cache.put("c", signature, b"cccc")
+    assert cache.get("b", signature) is None
+    assert cache.get("a", signature) == b"aaaa"
+    assert cache.get("c", signature) == b"cccc"
+
+    # Replacing an entry releases its old size; oversized bodies are skipped.
+    cache.put("a", signature, b"a")
+    cache.put("d", signature, b"dddd")
+    assert cache.get("c", signature) == b"cccc"
+    cache.put("e", signature, b"e" * 11)
+    assert cache.get("e", signature) is None
+    assert cache.get("d", signature) == b"dddd"
+
+
+def test_slice_streams_entries_under_prefix_in_batches(
+    client: TestClient, db_path: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(server_app, "_SLICE_CHUNK_BYTES", 64)
+    items = [{"coords": ["u1", f"k{i:03}"], "value": i} for i in range(100)]
+    items.append({"coords": ["u2", "a"], "value": "other"})
+    client.post("/items", params={"path": db_path}, json={"items": items})
+
+    data = AxisDB.open(db_path, mode="r").slice(("u1",))
+    chunks = list(server_app._stream_slice(["u1"], data))
+    assert 1 < len(chunks) < 100
+    assert all(len(chunk) < 64 + 32 for chunk in chunks)
+
+    resp = client.get("/slice", params={"path": db_path, "prefix": "u1"})
+    assert resp.content == b"".join(chunks)
+    assert resp.json() == {
+        "prefix": ["u1"],
+        "data": {"u1": {f"k{i:03}": i for i in range(100)}},
+    }
+
+    full = AxisDB.open(db_path, mode="r").slice(("u1", "k007"))
+    assert b"".join(server_app._stream_slice(["u1", "k007"], full)) == (
+        b'{"prefix":["u1","k007"],"data":{"u1":{"k007":7}}}'
+    )
+    assert b"".join(server_app._stream_slice(["u3"], {})) == (
+        b'{"prefix":["u3"],"data":{}}'
+    )
@@ -1,15 +1,18 @@
-from __future__ import annotations
-
 import json
+import mmap
+import os
 from pathlib import Path
+from typing import Any
 
 import pytest
 
+from axisdb.engine import jsoncodec, storage
 from axisdb.engine.storage import (
     StoragePaths,
     default_payload,
     read_validated,
     recover_if_needed,
+    write_atomic,
 )
 from axisdb.errors import StorageCorruptionError
 
@@ -66,3 +69,55 @@ def test_recovery_raises_when_no_valid_file_exists(tmp_path: Path) -> None:
 
     with pytest.raises(StorageCorruptionError):
         recover_if_needed(paths)
+
+
+def test_failed_write_keeps_main_and_removes_tmp(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    db_path = tmp_path / "db.json"
+    paths = StoragePaths(db_path=db_path)
+    write_atomic(paths, default_payload(dimensions=1))
+
+    def _fail_fsync(fd: int) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "fsync", _fail_fsync)
+    with pytest.raises(StorageCorruptionError):
+        write_atomic(paths, default_payload(dimensions=2))
+
+    assert not paths.tmp_path.exists()
+    assert read_validated(db_path)["meta"]["dimensions"] == 1
+
+
+def test_large_file_is_read_through_mmap(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    if not jsoncodec.accepts_buffers():
+        pytest.skip("JSON codec cannot parse from a buffer")
+    mapped: list[int] = []
+    real_mmap = mmap.mmap
+
+    def _counting_mmap(fileno: int, length: int, **kwargs: Any) -> mmap.mmap:
+        mapped.append(fileno)
+        return real_mmap(fileno, length, **kwargs)
+
+    monkeypatch.setattr(storage.mmap, "mmap", _counting_mmap)
+
+    db_path = tmp_path / "db.json"
+    paths = StoragePaths(db_path=db_path)
+    payload = default_payload(dimensions=2)
+    payload["data"] = {"a/b": {"v": 1}}
+    write_atomic(paths, payload)
+
+    # Below the threshold the file is read into memory.
+    assert read_validated(db_path)["data"] == {"a/b": {"v": 1}}
+    assert mapped == []
+
+    monkeypatch.setattr(storage, "_MMAP_MIN_BYTES", 1)
+    assert read_validated(db_path)["data"] == {"a/b": {"v": 1}}
+    assert len(mapped) == 1
+
+    db_path.write_bytes(b"{not json" + b" " * 64)
+    with pytest.raises(StorageCorruptionError):
+        read_validated(db_path)
+    assert len(mapped) == 2
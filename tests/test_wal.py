@@ -0,0 +1,217 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from axisdb import AxisDB
+from axisdb.engine import storage
+from axisdb.engine.storage import StoragePaths, read_validated, read_wal
+from axisdb.errors import StorageCorruptionError
+from axisdb.query.ast import Field
+
+
+def test_small_commit_is_appended_to_wal(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.json"
+    paths = StoragePaths(db_path=db_path)
+    db = AxisDB.create(db_path, dimensions=1)
+    db.set(("a",), 1)
+    db.commit()
+
+    assert paths.wal_path.exists()
+    assert read_validated(db_path)["data"] == {}
+
+    ro = AxisDB.open(db_path, mode="r")
+    assert ro.get(("a",)) == 1
+
+
+def test_wal_replays_deletes(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.json"
+    db = AxisDB.create(db_path, dimensions=1)
+    db.set(("a",), 1)
+    db.set(("b",), 2)
+    db.commit()
+    db.delete(("a",))
+    db.commit()
+
+    ro = AxisDB.open(db_path, mode="r")
+    assert ro.list() == [("b",)]
+
+
+def test_compact_folds_wal_into_snapshot(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.json"
+    paths = StoragePaths(db_path=db_path)
+    db = AxisDB.create(db_path, dimensions=1)
+    db.set(("a",), {"v": 1})
+    db.commit()
+    db.compact()
+
+    payload = read_validated(db_path)
+    assert read_wal(paths, payload) == []
+    assert payload["data"] == {"a": {"v": 1}}
+    assert payload["index"]["prefix_keys"] == ["a"]
+
+
+def test_wal_growing_past_snapshot_triggers_compaction(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.json"
+    paths = StoragePaths(db_path=db_path)
+    db = AxisDB.create(db_path, dimensions=1)
+    db.set(("big",), "x" * 10_000)
+    db.commit()
+
+    payload = read_validated(db_path)
+    assert read_wal(paths, payload) == []
+    assert payload["data"]["big"] == "x" * 10_000
+
+
+def test_torn_wal_tail_is_ignored_and_truncated(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.json"
+    paths = StoragePaths(db_path=db_path)
+    db = AxisDB.create(db_path, dimensions=1)
+    db.set(("a",), 1)
+    db.commit()
+    db.rollback()
+    committed = paths.wal_path.read_bytes()
+
+    with open(paths.wal_path, "ab") as f:
+        f.write(b'{"op": "set", "key": "b", "val')
+
+    ro = AxisDB.open(db_path, mode="r")
+    assert ro.list() == [("a",)]
+    assert paths.wal_path.read_bytes() == committed
+
+
+def test_torn_commit_is_dropped_whole(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.json"
+    paths = StoragePaths(db_path=db_path)
+    db = AxisDB.create(db_path, dimensions=1)
+    db.set(("from",), 0)
+    db.set(("to",), 0)
+    db.commit()
+    committed = len(paths.wal_path.read_bytes())
+
+    db.set(("from",), 50)
+    db.set(("to",), 50)
+    db.commit()
+    db.rollback()
+
+    # Cut the second commit after its first operation.
+    wal = paths.wal_path.read_bytes()
+    cut = wal.index(b"}", committed) + 1
+    paths.wal_path.write_bytes(wal[:cut])
+
+    ro = AxisDB.open(db_path, mode="r")
+    assert (ro.get(("from",)), ro.get(("to",))) == (0, 0)
+
+
+def test_create_overwrite_discards_existing_wal(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.json"
+    with AxisDB.create(db_path, dimensions=1) as db:
+        db.set(("a",), 1)
+        db.commit()
+
+    with AxisDB.create(db_path, dimensions=1, overwrite=True) as db:
+        assert db.list() == []
+
+
+def test_find_uses_rebuilt_index_after_wal_commit(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.json"
+    db = AxisDB.create(db_path, dimensions=2)
+    db.define_field_index("by_customer_id", ("customer_id",))
+    db.set(("orders", "1"), {"customer_id": "c1"})
+    db.commit()
+
+    db.set(("orders", "2"), {"customer_id": "c2"})
+    db.commit()
+    wal_lines = StoragePaths(db_path=db_path).wal_path.read_text().splitlines()
+    assert json.loads(wal_lines[-1])["ops"][0]["key"] == "orders/2"
+
+    expr = Field(("customer_id",), "==", "c2")
+    assert db.find(prefix=("orders",), where=expr) == [
+        (("orders", "2"), {"customer_id": "c2"})
+    ]
+    ro = AxisDB.open(db_path, mode="r")
+    assert ro.find(prefix=("orders",), where=expr) == [
+        (("orders", "2"), {"customer_id": "c2"})
+    ]
+
+
+def test_failed_append_leaves_wal_readable(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    db_path = tmp_path / "db.json"
+    paths = StoragePaths(db_path=db_path)
+    db = AxisDB.create(db_path, dimensions=1)
+    db.set(("a",), 1)
+    db.commit()
+    committed = paths.wal_path.read_bytes()
+
+    real_write = os.write
+    calls = 0
+
+    def _short_then_fail(fd: int, data: bytes) -> int:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            return real_write(fd, bytes(data[: len(data) // 2]))
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "write", _short_then_fail)
+    db.set(("b",), 2)
+    with pytest.raises(StorageCorruptionError):
+        db.commit()
+    monkeypatch.undo()
+
+    assert paths.wal_path.read_bytes() == committed
+    db.commit()
+
+    ro = AxisDB.open(db_path, mode="r")
+    assert ro.list() == [("a",), ("b",)]
+
+
+def test_crash_before_wal_reset_does_not_replay_old_commits(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    db_path = tmp_path / "db.json"
+    with AxisDB.create(db_path, dimensions=1) as db:
+        db.set(("a",), 1)
+        db.set(("b",), "keep")
+        db.commit()
+
+        # Compacts (the value outgrows the snapshot), then "crashes" before
+        # the old WAL is reset.
+        monkeypatch.setattr("axisdb.api.reset_wal", lambda paths, generation: None)
+        db.set(("a",), 2)
+        db.delete(("b",))
+        db.set(("big",), "x" * 10_000)
+        db.commit()
+    monkeypatch.undo()
+
+    with AxisDB.open(db_path) as db:
+        assert db.get(("a",)) == 2
+        assert not db.exists(("b",))
+        db.set(("c",), 3)
+        db.commit()
+
+    ro = AxisDB.open(db_path, mode="r")
+    assert ro.list() == [("a",), ("big",), ("c",)]
+
+
+def test_legacy_format_is_upgraded_by_first_commit(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.json"
+    paths = StoragePaths(db_path=db_path)
+    payload = storage.default_payload(dimensions=1)
+    payload["format_version"] = 2
+    del payload["meta"]["generation"]  # type: ignore[misc]
+    payload["data"] = {"a": 1}
+    db_path.write_text(json.dumps(payload))
+
+    with AxisDB.open(db_path) as db:
+        assert db.get(("a",)) == 1
+        db.set(("b",), 2)
+        db.commit()
+
+    upgraded = read_validated(db_path)
+    assert upgraded["format_version"] == storage.FORMAT_VERSION
+    assert upgraded["data"] == {"a": 1, "b": 2}
+    assert read_wal(paths, upgraded) == []